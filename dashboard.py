@@ -1,7 +1,9 @@
 import streamlit as st
 import pandas as pd
+import altair as alt
 from datetime import datetime, timedelta
-from db_utils import get_data
+from db_utils import get_data, get_dates, get_heatmap
+from simulation import BACKING_THRESHOLD
 
 st.set_page_config(page_title="DAM Merit Plants - Operational View", layout="wide")
 
@@ -20,32 +22,6 @@ st.markdown("""
         font-family: 'Courier New', Courier, monospace;
     }
 
-    /* Buttons / Grid Selector */
-    .stButton>button {
-        width: 100%;
-        padding: 2px;
-        font-size: 10px;
-        border-radius: 4px;
-        background-color: #000000 !important;
-        color: #00FF00 !important;
-        border: 1px solid #FFFFFF !important;
-        transition: all 0.3s;
-    }
-    
-    .stButton>button:hover {
-        background-color: #00FF00 !important;
-        color: #000000 !important;
-        border-color: #00FF00 !important;
-    }
-
-    /* Selected Block Button */
-    div.stButton > button[kind="primary"] {
-        background-color: #00FF00 !important;
-        color: #000000 !important;
-        border: 2px solid #FFFFFF !important;
-        font-weight: bold;
-    }
-
     /* Tables */
     .stDataFrame, div[data-testid="stTable"] {
         border: 1px solid #FFFFFF !important;
@@ -138,34 +114,79 @@ def get_time_range(block):
 if 'selected_block' not in st.session_state:
     st.session_state.selected_block = 1
 
-# Grid Selector Section
-st.subheader("🕒 GRID SELECTOR (TIME RANGES)")
-
-# Create 6x16 Grid
-for r in range(6):
-    cols = st.columns(16)
-    for c in range(16):
-        block_num = r * 16 + c + 1
-        is_selected = st.session_state.selected_block == block_num
-        # Use full time range label
-        time_label = get_time_range(block_num)
-        
-        if cols[c].button(time_label, key=f"btn_{block_num}", type="primary" if is_selected else "secondary"):
-            st.session_state.selected_block = block_num
-            st.rerun()
-
-st.info(f"MONITORING: **BLOCK {st.session_state.selected_block}** | **TIME: {get_time_range(st.session_state.selected_block)}**")
-
 # Sidebar Filters
 st.sidebar.markdown("<h2 style='color: #00FF00;'>CONTROLS</h2>", unsafe_allow_html=True)
 remove_zero_dc = st.sidebar.checkbox("Remove plants with DC = 0", value=False)
 
+HEATMAP_METRICS = {'Backing Quantum (MW)': 'backing_mw', 'DC - SG (MW)': 'headroom_mw'}
+heatmap_label = st.sidebar.radio("HEATMAP METRIC", list(HEATMAP_METRICS))
+heatmap_metric = HEATMAP_METRICS[heatmap_label]
+heatmap_category = st.sidebar.radio("HEATMAP CATEGORY", ['All', 'State', 'Central'], horizontal=True)
+
+@st.cache_data(ttl=60)
+def fetch_dates():
+    return get_dates()
+
+@st.cache_data(ttl=60)
+def fetch_heatmap(start_date, end_date, category):
+    return get_heatmap(start_date, end_date, None if category == 'All' else category)
+
+dates = fetch_dates()
+if dates and 'selected_date' not in st.session_state:
+    st.session_state.selected_date = dates[-1].isoformat()
+
+# Grid Selector Section: block x date heatmap, click a cell to select it
+st.subheader("🕒 GRID SELECTOR (BLOCK x DATE)")
+
+if dates:
+    # A month ending on the latest ingested day by default
+    date_range = st.sidebar.date_input(
+        "DATE RANGE",
+        value=(max(dates[0], dates[-1] - timedelta(days=30)), dates[-1]),
+        min_value=dates[0],
+        max_value=dates[-1],
+    )
+    start_date, end_date = (date_range[0], date_range[-1]) if date_range else (dates[-1], dates[-1])
+
+    heat = fetch_heatmap(start_date, end_date, heatmap_category)
+    if heat.empty:
+        st.warning(f"SYSTEM ALERT: No heatmap data for {start_date} - {end_date}")
+    else:
+        heat['time_range'] = heat['time_block'].map(get_time_range)
+
+        cell = alt.selection_point(name='cell', fields=['report_date', 'time_block'], on='click')
+        chart = alt.Chart(heat).mark_rect().encode(
+            x=alt.X('time_block:O', title='Time Block', axis=alt.Axis(values=list(range(1, 97, 4)), labelAngle=0)),
+            y=alt.Y('report_date:O', title='Date', sort='descending'),
+            color=alt.Color(f'{heatmap_metric}:Q', title=heatmap_label, scale=alt.Scale(scheme='greens')),
+            opacity=alt.condition(cell, alt.value(1.0), alt.value(0.35)),
+            tooltip=[
+                alt.Tooltip('report_date:O', title='Date'),
+                alt.Tooltip('time_block:O', title='Block'),
+                alt.Tooltip('time_range:N', title='Time'),
+                alt.Tooltip(f'{heatmap_metric}:Q', title=heatmap_label, format=',.2f'),
+            ],
+        ).add_params(cell).properties(
+            height=max(120, 18 * heat['report_date'].nunique())
+        ).configure(background='#000000').configure_axis(
+            labelColor='#00FF00', titleColor='#00FF00', gridColor='#FFFFFF', domainColor='#FFFFFF'
+        ).configure_legend(labelColor='#00FF00', titleColor='#00FF00').configure_view(stroke='#FFFFFF')
+
+        event = st.altair_chart(chart, use_container_width=True, theme=None, on_select="rerun", key="heatmap")
+        selected = event.selection.get('cell', []) if event else []
+        if selected:
+            st.session_state.selected_block = int(selected[0]['time_block'])
+            st.session_state.selected_date = str(selected[0]['report_date'])
+
+selected_date = st.session_state.get('selected_date')
+st.info(f"MONITORING: **{selected_date or 'NO DATA'}** | **BLOCK {st.session_state.selected_block}** | **TIME: {get_time_range(st.session_state.selected_block)}**")
+
 # Fetch Data for specific block
 @st.cache_data(ttl=60)
-def fetch_block_data(block_num):
-    return get_data(block_num)
+def fetch_block_data(block_num, report_date):
+    return get_data(block_num, report_date)
 
-df = fetch_block_data(st.session_state.selected_block)
+df = fetch_block_data(st.session_state.selected_block, selected_date)
 
 if not df.empty:
     # Sorting by Variable Cost (bid_price_mwh) in Decreasing Order
@@ -199,8 +220,8 @@ if not df.empty:
         # Cumulative backing quantum = Sum of (DC - SG)
         total_quantum = (active_df['dc_mw'] - active_df['sg_mw']).sum()
         
-        # Filter for plants whose SG < 0.98 * DC
-        backing_candidates = active_df[active_df['sg_mw'] < 0.98 * active_df['dc_mw']]
+        # Filter for plants whose SG < BACKING_THRESHOLD (0.98) * DC
+        backing_candidates = active_df[active_df['sg_mw'] < BACKING_THRESHOLD * active_df['dc_mw']]
         
         if not backing_candidates.empty:
             # Lowest Variable Cost plant
@@ -231,7 +252,7 @@ if not df.empty:
     st.markdown("<hr style='border: 1px solid #FFFFFF;'>", unsafe_allow_html=True)
     
     # Detailed Table
-    st.subheader(f"📊 MERIT ORDER DATA - BLOCK {st.session_state.selected_block}")
+    st.subheader(f"📊 MERIT ORDER DATA - {selected_date} BLOCK {st.session_state.selected_block}")
     
     # Custom HTML Table implementation for 100% style control
     def render_custom_table(df):
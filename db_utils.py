@@ -1,18 +1,76 @@
 import duckdb
 import pandas as pd
+from simulation import ACTIVE_SQL
 
 DB_FILE = 'database.db'
 
-def get_data(block_num):
+# Resolves a NULL report_date parameter to the most recent ingested day
+LATEST_DATE = "COALESCE(?::DATE, (SELECT MAX(report_date) FROM plant_data))"
+
+HEATMAP_COLUMNS = ['report_date', 'time_block', 'backing_mw', 'headroom_mw']
+
+def fetch_data(block_num, report_date=None):
+    """
+    Rows of one time block, defaulting to the latest ingested day. Errors
+    propagate; get_data() is the dashboard's non-raising wrapper.
+    """
+    conn = duckdb.connect(DB_FILE, read_only=True)
+    try:
+        query = f"SELECT * FROM plant_data WHERE time_block = ? AND report_date = {LATEST_DATE}"
+        return conn.execute(query, [block_num, report_date]).df()
+    finally:
+        conn.close()
+
+def get_data(block_num, report_date=None):
     """
     Fetch data for a specific time block directly from DuckDB.
+    Defaults to the latest ingested day.
+    """
+    try:
+        return fetch_data(block_num, report_date)
+    except Exception as e:
+        print(f"Error fetching data: {e}")
+        return pd.DataFrame()
+
+def get_dates():
+    """
+    All ingested days, oldest first.
+    """
+    try:
+        conn = duckdb.connect(DB_FILE, read_only=True)
+        dates = conn.execute("SELECT DISTINCT report_date FROM plant_data ORDER BY report_date").fetchall()
+        conn.close()
+        return [d[0] for d in dates]
+    except Exception as e:
+        print(f"Error fetching dates: {e}")
+        return []
+
+def get_heatmap(start_date, end_date, category=None):
+    """
+    One row per (report_date, time_block) between start_date and end_date,
+    aggregated inside DuckDB: the thermal backing quantum (DC - SG over the
+    active plants) and the plain DC - SG total.
     """
+    query = f"""
+        SELECT
+            strftime(report_date, '%Y-%m-%d') AS report_date,
+            time_block,
+            SUM(CASE WHEN {ACTIVE_SQL} THEN dc_mw - sg_mw ELSE 0 END) AS backing_mw,
+            SUM(dc_mw - sg_mw) AS headroom_mw
+        FROM plant_data
+        WHERE report_date BETWEEN ? AND ?
+    """
+    params = [start_date, end_date]
+    if category:
+        query += " AND category = ?"
+        params.append(category)
+    query += " GROUP BY report_date, time_block ORDER BY report_date, time_block"
     try:
         conn = duckdb.connect(DB_FILE, read_only=True)
-        query = "SELECT * FROM plant_data WHERE time_block = ?"
-        df = conn.execute(query, [block_num]).df()
+        df = conn.execute(query, params).df()
         conn.close()
         return df
     except Exception as e:
-        print(f"Error fetching data: {e}")
-        return pd.DataFrame()
+        # e.g. ingest holding the write lock; callers still get the expected columns
+        print(f"Error fetching heatmap: {e}")
+        return pd.DataFrame(columns=HEATMAP_COLUMNS)
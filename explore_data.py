@@ -1,6 +1,8 @@
 import pandas as pd
 import os
 import sys
+from headers import source_headers
+from sources import SOURCE_ADAPTERS
 
 # Save output to a file
 with open('data_exploration_results.txt', 'w', encoding='utf-8') as f:
@@ -21,22 +23,21 @@ with open('data_exploration_results.txt', 'w', encoding='utf-8') as f:
     except Exception as e:
         print(f"Error reading MOD file: {e}")
 
-    csv_files = ['entvsdl.csv', 'ipp.csv', 'uprvunl.csv', 'upjvnl.csv', 'cpp.csv', 'trader.csv']
+    headers = source_headers(data_dir)
 
-    for file in csv_files:
+    for file, adapter in SOURCE_ADAPTERS.items():
         print(f"\n--- {file} ---")
-        path = os.path.join(data_dir, file)
+        if file not in headers:
+            print(f"Error reading {file}: file not found")
+            continue
+        cols = headers[file]['columns']
+        print("Flattened Columns:", cols)
+        if headers[file]['sg_labels']:
+            print("Utility Labels:", headers[file]['sg_labels'])
         try:
-            if file == 'entvsdl.csv':
-                # Read multiple headers
-                df = pd.read_csv(path, header=[0, 1, 2], nrows=5)
-                # Flatten multi-index columns for easier reading in the text file
-                print("Flattened Columns:", [' | '.join(col).strip() for col in df.columns.values])
-                print(df.head())
-            else:
-                df = pd.read_csv(path, nrows=5)
-                print("Columns:", df.columns.tolist())
-                print(df.head())
+            df = pd.read_csv(os.path.join(data_dir, file), nrows=5, **adapter.read_kwargs())
+            df.columns = cols
+            print(df.head())
         except Exception as e:
             print(f"Error reading {file}: {e}")
 
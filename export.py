@@ -0,0 +1,142 @@
+import duckdb
+import os
+import shutil
+import tempfile
+from simulation import ACTIVE_SQL, CANDIDATE_SQL
+
+# Bulk export of plant_data and the derived thermal backing results to
+# date-partitioned Parquet/CSV files, written by DuckDB COPY. Every ingest
+# is recorded in ingest_runs with an increasing version, so a consumer can
+# ask only for the days re-ingested since the last version it has seen.
+
+DB_FILE = 'database.db'
+EXPORT_DIR = 'exports'
+
+COMPRESSIONS = {
+    'parquet': ('zstd', 'snappy', 'gzip', 'uncompressed'),
+    'csv': ('gzip', 'zstd', 'none'),
+}
+DEFAULT_COMPRESSION = {'parquet': 'zstd', 'csv': 'gzip'}
+
+BACKING_QUERY = f"""
+    SELECT
+        report_date,
+        time_block,
+        category,
+        arg_min(plant_name, bid_price_mwh) FILTER (WHERE {CANDIDATE_SQL}) AS backing_plant,
+        MIN(bid_price_mwh) FILTER (WHERE {CANDIDATE_SQL}) AS backing_cost_mwh,
+        COALESCE(SUM(dc_mw - sg_mw) FILTER (WHERE {ACTIVE_SQL}), 0) AS backing_mw
+    FROM plant_data
+    WHERE report_date IN ({{dates}})
+    GROUP BY report_date, time_block, category
+    ORDER BY report_date, time_block, category
+"""
+
+PLANT_DATA_QUERY = """
+    SELECT * FROM plant_data
+    WHERE report_date IN ({dates})
+    ORDER BY report_date, time_block, plant_name
+"""
+
+EXPORTS = {'plant_data': PLANT_DATA_QUERY, 'backing': BACKING_QUERY}
+
+
+def date_versions(conn):
+    """
+    Latest ingest version of every day in plant_data (-1 for days loaded
+    before ingest_runs existed, so since_version=0 still includes them).
+    """
+    has_runs = conn.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = 'ingest_runs'"
+    ).fetchone()[0]
+    if not has_runs:
+        rows = conn.execute("SELECT DISTINCT report_date, -1 FROM plant_data").fetchall()
+    else:
+        rows = conn.execute("""
+            SELECT d.report_date, COALESCE(MAX(r.version), -1)
+            FROM (SELECT DISTINCT report_date FROM plant_data) d
+            LEFT JOIN ingest_runs r USING (report_date)
+            GROUP BY d.report_date
+        """).fetchall()
+    return dict(rows)
+
+
+def export(output_dir=EXPORT_DIR, fmt='parquet', compression=None, since_version=None, tables=tuple(EXPORTS), conn=None):
+    """
+    Write the requested tables to output_dir/<fmt>/<table>/report_date=YYYY-MM-DD/,
+    one tree per format so a CSV export never replaces a Parquet partition.
+    With since_version only days ingested after that version are rewritten.
+    Returns a manifest with the exported dates and the version to pass as
+    since_version next time. An open connection can be passed in (DuckDB
+    refuses a read-only and a read-write connection to the same file within
+    one process); otherwise a read-only one is opened and closed here.
+    """
+    if fmt not in COMPRESSIONS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {tuple(COMPRESSIONS)}")
+    compression = compression or DEFAULT_COMPRESSION[fmt]
+    if compression not in COMPRESSIONS[fmt]:
+        raise ValueError(f"Unknown {fmt} compression {compression!r}, expected one of {COMPRESSIONS[fmt]}")
+    unknown = [t for t in tables if t not in EXPORTS]
+    if unknown:
+        raise ValueError(f"Unknown export table(s) {unknown}, expected {tuple(EXPORTS)}")
+
+    own_conn = conn is None
+    if own_conn:
+        conn = duckdb.connect(DB_FILE, read_only=True)
+    versions = date_versions(conn)
+    latest = max([0, *versions.values()])
+    # Runs are numbered from 1, so since_version 0 means nothing was exported
+    # yet and also picks up the unversioned (-1) days
+    full = since_version is None or since_version < 1
+    dates = sorted(d for d, v in versions.items() if full or v > since_version)
+
+    manifest = {'version': latest, 'format': fmt, 'compression': compression, 'dates': [str(d) for d in dates], 'files': []}
+    if not dates:
+        if own_conn:
+            conn.close()
+        return manifest
+
+    date_list = ', '.join(f"DATE '{d.isoformat()}'" for d in dates)
+    for table in tables:
+        table_dir = os.path.join(output_dir, fmt, table)
+        os.makedirs(table_dir, exist_ok=True)
+        # COPY into a sibling temp dir and swap whole partitions in afterwards,
+        # so a failed COPY leaves the previous export intact and a day never
+        # mixes files from two ingests
+        staging = tempfile.mkdtemp(prefix=f".{table}-", dir=os.path.dirname(table_dir))
+        try:
+            conn.execute(f"""
+                COPY ({EXPORTS[table].format(dates=date_list)}) TO '{staging.replace("'", "''")}'
+                (FORMAT {fmt}, COMPRESSION {compression}, PARTITION_BY (report_date), OVERWRITE_OR_IGNORE)
+            """)
+            for d in dates:
+                name = f"report_date={d}"
+                staged = os.path.join(staging, name)
+                if not os.path.isdir(staged):
+                    continue
+                partition = os.path.join(table_dir, name)
+                if os.path.isdir(partition):
+                    os.rename(partition, os.path.join(staging, f"old-{name}"))
+                os.rename(staged, partition)
+                manifest['files'].extend(os.path.join(partition, f) for f in sorted(os.listdir(partition)))
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    if own_conn:
+        conn.close()
+    return manifest
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Export plant_data and backing results to date-partitioned files.")
+    parser.add_argument('--output', default=EXPORT_DIR, help="Directory to write the partitions to")
+    parser.add_argument('--format', choices=tuple(COMPRESSIONS), default='parquet')
+    parser.add_argument('--compression', help="parquet: zstd/snappy/gzip/uncompressed, csv: gzip/zstd/none")
+    parser.add_argument('--since-version', type=int, default=None,
+                        help="Only export days ingested after this version")
+    parser.add_argument('--tables', nargs='+', choices=tuple(EXPORTS), default=list(EXPORTS))
+    args = parser.parse_args()
+    manifest = export(args.output, args.format, args.compression, args.since_version, args.tables)
+    print(json.dumps(manifest, indent=4))
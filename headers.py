@@ -0,0 +1,111 @@
+import pandas as pd
+import os
+import io
+import json
+from itertools import islice
+from sources import DATA_DIR, SOURCE_ADAPTERS
+
+# Header-only introspection of the registered CSV sources. Only the header
+# lines of each file are decoded, and the flattened column lists are cached
+# per file fingerprint (path, size, mtime) so repeated coverage checks over
+# many daily drops skip files that have not changed.
+
+HEADER_CACHE_FILE = '.header_cache.json'
+
+_cache = None
+
+
+def header_line_count(adapter):
+    header = adapter.header
+    # Any label_row (menukhsg utility labels) sits above the header row
+    return (max(header) if isinstance(header, list) else header) + 1
+
+
+def fingerprint(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _load_cache():
+    global _cache
+    if _cache is None:
+        _cache = {}
+        if os.path.exists(HEADER_CACHE_FILE):
+            try:
+                with open(HEADER_CACHE_FILE, 'r', encoding='utf-8') as f:
+                    _cache = json.load(f)
+            except (OSError, ValueError):
+                _cache = {}
+    return _cache
+
+
+def save_cache():
+    if _cache is not None:
+        with open(HEADER_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(_cache, f)
+
+
+def parse_headers(path, adapter):
+    """
+    Read only the header lines of a source file and flatten them exactly
+    like the adapter does during ingest. Returns the column list and the
+    utility labels mapped to their column (label_row layouts only).
+    """
+    with open(path, 'r', encoding=adapter.encoding or 'utf-8', newline='') as f:
+        text = ''.join(islice(f, header_line_count(adapter)))
+
+    df = pd.read_csv(io.StringIO(text), header=adapter.header, nrows=0)
+    cols = adapter.flatten(df.columns)
+
+    sg_labels = {}
+    if adapter.label_row is not None:
+        df_header = pd.read_csv(io.StringIO(text), header=None, nrows=adapter.label_row + 3)
+        sg_labels = adapter.parse_labels(df_header, cols)
+
+    return {'columns': cols, 'sg_labels': sg_labels}
+
+
+def read_headers(path, adapter):
+    """
+    Cached parse_headers(); the entry is reused while the file fingerprint
+    and the adapter's read config are unchanged.
+    """
+    cache = _load_cache()
+    key = os.path.abspath(path)
+    fp = fingerprint(path)
+    entry = cache.get(key)
+    config = adapter.config
+    if entry and entry['fingerprint'] == fp and entry['config'] == config:
+        return entry['headers']
+    headers = parse_headers(path, adapter)
+    cache[key] = {'fingerprint': fp, 'config': config, 'headers': headers}
+    return headers
+
+
+def source_headers(data_dir=DATA_DIR, adapters=SOURCE_ADAPTERS):
+    """
+    Headers of every registered source present in data_dir, keyed by filename.
+    """
+    result = {}
+    for filename, adapter in adapters.items():
+        path = os.path.join(data_dir, filename)
+        if not os.path.exists(path):
+            continue
+        result[filename] = read_headers(path, adapter)
+    save_cache()
+    return result
+
+
+def scan_headers(root, adapters=SOURCE_ADAPTERS):
+    """
+    Walk root (e.g. a folder of daily drops) and return the headers of every
+    file whose name matches a registered source, keyed by path.
+    """
+    result = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in sorted(filenames):
+            if filename in adapters:
+                path = os.path.join(dirpath, filename)
+                result[path] = read_headers(path, adapters[filename])
+    save_cache()
+    return result
@@ -3,29 +3,20 @@ import duckdb
 import os
 import json
 import re
+from datetime import date
+from validation import (
+    DEFAULT_POLICY, FAIL_POLICIES, MAX_COERCION_RATE,
+    ValidationError, build_report, check_mappings, check_source, enforce_policy, first_series,
+)
+from sources import DATA_DIR, SOURCE_ADAPTERS
 
 # Configuration
-DATA_DIR = 'data'
 MOD_FILE = os.path.join(DATA_DIR, 'MOD List Dec_16-12-2025.xlsx')
 MAPPING_FILE = 'plant_mappings.json'
 DB_FILE = 'database.db'
 
-CSV_CONFIGS = {
-    'entvsdl.csv': {'header': [0, 1, 2]},
-    'ipp.csv': {'header': 0},
-    'trader.csv': {'header': 0},
-    'uprvunl.csv': {'header': 0},
-    'menukhdc.csv': {'header': [0, 1], 'encoding': 'utf-16le'},
-    'menukhsg.csv': {'header': 6, 'encoding': 'utf-16le', 'special_sg': True}
-}
-
-def clean_col_name(col):
-    if isinstance(col, tuple):
-        return ' | '.join([str(c).strip() for c in col if 'Unnamed' not in str(c)])
-    return str(col).strip()
-
-def ingest():
-    print("Starting ingestion...")
+def ingest(report_date, policy=DEFAULT_POLICY, max_coercion_rate=MAX_COERCION_RATE, report_file=None):
+    print(f"Starting ingestion for {report_date}...")
     
     # 1. Load Mappings
     with open(MAPPING_FILE, 'r', encoding='utf-8') as f:
@@ -38,11 +29,57 @@ def ingest():
     plant_col = next((c for c in df_mod.columns if 'Plant Name' in c), 'Plant Name')
     type_col = next((c for c in df_mod.columns if 'Type' in c), 'Type')
     
-    # 3. Initialize DuckDB
+    # Bid Price and Type per MOD plant, looked up once for every file
+    mod_info = {}
+    for mod_name in plant_mappings:
+        try:
+            mod_row = df_mod[df_mod[plant_col] == mod_name].iloc[0]
+            bid_price = mod_row[price_col]
+            # If Rs/kWh, convert to Rs/MWh
+            if 'Rs/kWh' in str(price_col):
+                bid_price = float(bid_price) * 1000
+            mod_info[mod_name] = (bid_price, str(mod_row[type_col]))
+        except (IndexError, KeyError, TypeError, ValueError):
+            mod_info[mod_name] = (0.0, "Unknown")
+    
+    # 3. Read and validate CSVs before touching the database
+    sources = {}
+    missing_files = []
+    for filename, adapter in SOURCE_ADAPTERS.items():
+        path = os.path.join(DATA_DIR, filename)
+        if not os.path.exists(path):
+            if policy == 'off':
+                print(f"Warning: {filename} not found.")
+            missing_files.append(filename)
+            continue
+        print(f"Reading {filename}...")
+        sources[filename] = adapter.read(path)
+
+    if policy != 'off':
+        file_results = {
+            filename: check_source(SOURCE_ADAPTERS[filename], src, plant_mappings, max_coercion_rate)
+            for filename, src in sources.items()
+        }
+        matched_plants = {p for r in file_results.values() for p in r['plants_matched']}
+        mapping_result = check_mappings(plant_mappings, df_mod, plant_col, price_col, matched_plants)
+        report = build_report(file_results, mapping_result, missing_files)
+        if report_file:
+            with open(report_file, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=4, default=str)
+        enforce_policy(report, policy)
+        print(f"Validation: {len(report['errors'])} error(s), {len(report['warnings'])} warning(s).")
+    
+    # 4. Initialize DuckDB. plant_data holds one day per report_date; a table
+    # from before report_date existed held a single unlabelled day and is rebuilt.
     conn = duckdb.connect(DB_FILE)
-    conn.execute("DROP TABLE IF EXISTS plant_data")
+    existing_cols = [r[0] for r in conn.execute(
+        "SELECT column_name FROM information_schema.columns WHERE table_name = 'plant_data'"
+    ).fetchall()]
+    if existing_cols and 'report_date' not in existing_cols:
+        conn.execute("DROP TABLE plant_data")
     conn.execute("""
-        CREATE TABLE plant_data (
+        CREATE TABLE IF NOT EXISTS plant_data (
+            report_date DATE,
             time_block INTEGER,
             time_desc VARCHAR,
             plant_name VARCHAR,
@@ -53,72 +90,29 @@ def ingest():
             bid_price_mwh DOUBLE
         )
     """)
+    # One row per ingest; version numbers back incremental exports
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ingest_runs (
+            version INTEGER,
+            report_date DATE,
+            row_count INTEGER,
+            ingested_at TIMESTAMP
+        )
+    """)
     
-    # 4. Process CSVs
+    # 5. Process CSVs
     final_records = []
     
-    for filename, config in CSV_CONFIGS.items():
-        path = os.path.join(DATA_DIR, filename)
-        if not os.path.exists(path):
-            print(f"Warning: {filename} not found.")
-            continue
-            
+    for filename, (df, cols, tb_col, td_col, labels) in sources.items():
+        adapter = SOURCE_ADAPTERS[filename]
         print(f"Processing {filename}...")
-        read_kwargs = {'header': config['header']}
-        if 'encoding' in config:
-            read_kwargs['encoding'] = config['encoding']
-            
-        df = pd.read_csv(path, **read_kwargs)
-        
-        # Flatten columns
-        if isinstance(df.columns, pd.MultiIndex):
-            cols = [clean_col_name(c) for c in df.columns]
-        else:
-            cols = df.columns.tolist()
-        df.columns = cols
-
-        # Specialized logic for menukhsg.csv header mapping
-        if config.get('special_sg'):
-            # Utility names are in Row 2 of the original file (which is Row -4 relative to header=6)
-            # but simpler to just use Row 0 of the df columns if we skipped correctly
-            # Actually, let's use the explicit row 2 from file
-            df_header = pd.read_csv(path, encoding=config['encoding'], header=None, nrows=5)
-            utility_row = df_header.iloc[2].tolist()
-            sg_mapping_override = {}
-            for i, val in enumerate(utility_row):
-                if pd.notna(val) and str(val).strip():
-                    sg_mapping_override[str(val).strip()] = df.columns[i]
-
-        # Extract Time Block and Time
-        tb_col = next((c for c in cols if 'TIME BLOCK' in str(c).upper() or 'TIMEBLOCK' in str(c).upper().replace(' ', '')), None)
-        td_col = next((c for c in cols if 'TIME DESC' in str(c).upper() or 'TIME' == str(c).upper().strip() or 'TIME' in str(c).upper()), None)
-        
-        # Fallback for menukhsg logic where Time Block might be in row 0
-        if tb_col is None:
-            first_row = df.iloc[0].astype(str).tolist()
-            for i, val in enumerate(first_row):
-                if 'TIME BLOCK' in val.upper():
-                    tb_col = df.columns[i]
-                elif 'TIME DESC' in val.upper() or '00:00-00:15' in val:
-                    td_col = df.columns[i]
         
         if tb_col is None or td_col is None:
             print(f"Error: Could not find Time Block/Desc columns in {filename}")
             continue
 
-        # Assign category
-        category = 'State' if filename in ['uprvunl.csv', 'ipp.csv'] else 'Central'
-
-        # DEFENSIVE: If multiple columns have the same name, take the first one
-        if isinstance(df[tb_col], pd.DataFrame):
-            df_tb = df[tb_col].iloc[:, 0]
-        else:
-            df_tb = df[tb_col]
-            
-        if isinstance(df[td_col], pd.DataFrame):
-            df_td = df[td_col].iloc[:, 0]
-        else:
-            df_td = df[td_col]
+        df_tb = first_series(df, tb_col)
+        df_td = first_series(df, td_col)
             
         # Re-assign to a temporary series to avoid name clashes during filter
         df['__tb'] = pd.to_numeric(df_tb, errors='coerce')
@@ -136,86 +130,27 @@ def ingest():
         
         # We only want blocks 1-96
         df = df[(df['__tb'] >= 1) & (df['__tb'] <= 96)]
-        
-        # Override original cols with cleaned ones for loop below
-        df[tb_col] = df['__tb']
-        df[td_col] = df['__td']
 
-        for mod_name, aliases in plant_mappings.items():
-            # Get Bid Price and Type from MOD
-            try:
-                mod_row = df_mod[df_mod[plant_col] == mod_name].iloc[0]
-                bid_price = mod_row[price_col]
-                # If Rs/kWh, convert to Rs/MWh
-                if 'Rs/kWh' in str(price_col):
-                    bid_price = float(bid_price) * 1000
-                plant_type = str(mod_row[type_col])
-            except:
-                bid_price = 0.0
-                plant_type = "Unknown"
-                
-            dc_cols = []
-            sg_cols = []
+        # Resolve plant -> DC/SG columns once, then clean every used column in one pass
+        resolved = adapter.resolve(cols, labels, plant_mappings)
+        used_cols = list(dict.fromkeys(c for dc_cols, sg_cols in resolved.values() for c in dc_cols + sg_cols))
+        values = adapter.clean_values(df[used_cols]) if used_cols else pd.DataFrame(index=df.index)
+
+        for mod_name, (dc_cols, sg_cols) in resolved.items():
+            bid_price, plant_type = mod_info[mod_name]
             
-            for alias in aliases:
-                # User confirmed Ghatampur in ipp.csv is a duplicate and should be ignored
-                if filename == 'ipp.csv' and mod_name == 'GHATAMPUR':
-                    continue
-                    
-                # Use special SG mapping for menukhsg if alias matches
-                if config.get('special_sg'):
-                    for util_name, col_name in sg_mapping_override.items():
-                        if alias.upper() in util_name.upper():
-                            sg_cols.append(col_name)
-                
-                for col in cols:
-                    if alias in col:
-                        # Logic to distinguish DC vs SG
-                        if filename == 'entvsdl.csv':
-                            if 'Final Ent Amount' in col and 'Onbar' in col:
-                                dc_cols.append(col)
-                            elif 'Schedule Amount' in col:
-                                sg_cols.append(col)
-                        elif filename == 'menukhdc.csv':
-                            # DC for these plants is strictly under "Total Ent"
-                            # We check the last part of the flattened column name
-                            if col.split(' | ')[-1] == 'Total Ent':
-                                dc_cols.append(col)
-                        else:
-                            if 'DC/' in col:
-                                dc_cols.append(col)
-                            elif 'SG' in col and filename != 'menukhsg.csv': # Skip general SG check if already handled by override
-                                sg_cols.append(col)
+            # Sum columns if multiple matches (e.g. multi-unit)
+            temp_df = pd.DataFrame()
+            temp_df['time_block'] = df['__tb']
+            temp_df['time_desc'] = df['__td']
+            temp_df['plant_name'] = mod_name
+            temp_df['plant_type'] = plant_type
+            temp_df['category'] = adapter.category
+            temp_df['dc_mw'] = values[dc_cols].sum(axis=1) if dc_cols else 0.0
+            temp_df['sg_mw'] = values[sg_cols].sum(axis=1) if sg_cols else 0.0
+            temp_df['bid_price_mwh'] = bid_price
             
-            # Deduplicate columns if they were matched multiple times
-            dc_cols = list(set(dc_cols))
-            sg_cols = list(set(sg_cols))
-
-            if dc_cols or sg_cols:
-                # Sum columns if multiple matches (e.g. multi-unit)
-                temp_df = pd.DataFrame()
-                temp_df['time_block'] = df[tb_col]
-                temp_df['time_desc'] = df[td_col]
-                temp_df['plant_name'] = mod_name
-                temp_df['plant_type'] = plant_type
-                temp_df['category'] = category
-                
-                if dc_cols:
-                    temp_df['dc_mw'] = pd.to_numeric(df[dc_cols].stack(), errors='coerce').unstack().sum(axis=1)
-                else:
-                    temp_df['dc_mw'] = 0.0
-                    
-                if sg_cols:
-                    # Values might have '+' or characters in menukhsg
-                    for c in sg_cols:
-                        df[c] = df[c].astype(str).str.replace('+', '', regex=False)
-                    temp_df['sg_mw'] = pd.to_numeric(df[sg_cols].stack(), errors='coerce').unstack().sum(axis=1)
-                else:
-                    temp_df['sg_mw'] = 0.0
-
-                temp_df['bid_price_mwh'] = bid_price
-                
-                final_records.append(temp_df)
+            final_records.append(temp_df)
 
     if final_records:
         df_final = pd.concat(final_records, ignore_index=True)
@@ -238,16 +173,44 @@ def ingest():
             'bid_price_mwh': 'max'
         })
         
+        df_final['report_date'] = report_date
+        
         # EXPLICITLY REORDER columns to match DuckDB schema
-        df_final = df_final[['time_block', 'time_desc', 'plant_name', 'plant_type', 'category', 'dc_mw', 'sg_mw', 'bid_price_mwh']]
+        df_final = df_final[['report_date', 'time_block', 'time_desc', 'plant_name', 'plant_type', 'category', 'dc_mw', 'sg_mw', 'bid_price_mwh']]
         
         # print(f"DEBUG: Post-aggregation rows: {len(df_final)}")
+        # Re-ingesting a day replaces it
+        conn.execute("BEGIN TRANSACTION")
+        conn.execute("DELETE FROM plant_data WHERE report_date = ?", [report_date])
         conn.append('plant_data', df_final)
-        print(f"Ingested {len(df_final)} rows.")
+        version = conn.execute("""
+            INSERT INTO ingest_runs
+            SELECT COALESCE(MAX(version), 0) + 1, ?, ?, current_timestamp FROM ingest_runs
+            RETURNING version
+        """, [report_date, len(df_final)]).fetchone()[0]
+        conn.execute("COMMIT")
+        print(f"Ingested {len(df_final)} rows for {report_date} (version {version}).")
     else:
         print("No data found to ingest.")
         
     conn.close()
 
 if __name__ == "__main__":
-    ingest()
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Ingest the daily CSV drops into DuckDB.")
+    parser.add_argument('--on-error', choices=FAIL_POLICIES, default=DEFAULT_POLICY,
+                        help="strict: abort on validation errors; warn: report and continue; off: skip validation")
+    parser.add_argument('--max-coercion-rate', type=float, default=MAX_COERCION_RATE,
+                        help="Largest share of non-numeric values tolerated in a value column")
+    parser.add_argument('--report', help="Write the validation report as JSON to this path")
+    # Required: a late or re-run drop must not be filed under the day it was ingested
+    parser.add_argument('--date', type=date.fromisoformat, required=True,
+                        help="Day the CSV drop belongs to (YYYY-MM-DD)")
+    args = parser.parse_args()
+    try:
+        ingest(args.date, policy=args.on_error, max_coercion_rate=args.max_coercion_rate, report_file=args.report)
+    except ValidationError as e:
+        print(e)
+        sys.exit(1)
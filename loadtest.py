@@ -0,0 +1,254 @@
+import asyncio
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+import duckdb
+import httpx
+import numpy as np
+import db_utils
+import main
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, RSS is reported as n/a
+    resource = None
+
+# In-process load generator for the API (main.app, through httpx's ASGI
+# transport, no network) and the dashboard data path (db_utils.fetch_data,
+# the raising core of get_data). Each scenario replays one operator access
+# pattern with N concurrent operators against a generated multi-day database
+# and reports latency percentiles and throughput of the successful calls, the
+# error rate, peak traced Python allocations and the process peak RSS.
+
+SCENARIOS = ('plants', 'data_range', 'data_block_sweep', 'get_data_sweep')
+
+
+def generate_database(path, days=30, plants=66, seed=0):
+    """
+    Write a synthetic plant_data table with days x 96 blocks x plants rows,
+    shaped like ingest output (about a third State, SG below DC, some SG = 0).
+    """
+    if os.path.exists(path):
+        os.remove(path)
+    conn = duckdb.connect(path)
+    conn.execute(f"SELECT setseed({(seed % 1000) / 1000})")
+    conn.execute("""
+        CREATE TABLE plant_data AS
+        WITH p AS (
+            SELECT
+                i AS plant_id,
+                'PLANT_' || lpad(i::VARCHAR, 3, '0') AS plant_name,
+                CASE WHEN i % 3 = 0 THEN 'State' ELSE 'Central' END AS category,
+                100 + random() * 900 AS capacity,
+                1200 + random() * 3000 AS bid_price_mwh
+            FROM range(?) t(i)
+        )
+        SELECT
+            (DATE '2025-01-01' + d::INTEGER) AS report_date,
+            b::INTEGER AS time_block,
+            strftime(TIMESTAMP '2025-01-01' + INTERVAL (15 * (b - 1)) MINUTE, '%H:%M') || '-' ||
+                strftime(TIMESTAMP '2025-01-01' + INTERVAL (15 * b) MINUTE, '%H:%M') AS time_desc,
+            p.plant_name,
+            'Thermal' AS plant_type,
+            p.category,
+            p.capacity AS dc_mw,
+            CASE WHEN random() < 0.2 THEN 0 ELSE p.capacity * (0.5 + random() * 0.5) END AS sg_mw,
+            p.bid_price_mwh
+        FROM range(?) r(d), range(1, 97) s(b), p
+        ORDER BY report_date, time_block, plant_name
+    """, [plants, days])
+    conn.execute("""
+        CREATE TABLE ingest_runs AS
+        SELECT row_number() OVER (ORDER BY report_date)::INTEGER AS version, report_date,
+               COUNT(*)::INTEGER AS row_count, current_timestamp AS ingested_at
+        FROM plant_data GROUP BY report_date
+    """)
+    plant_names = [r[0] for r in conn.execute("SELECT DISTINCT plant_name FROM plant_data").fetchall()]
+    dates = [r[0] for r in conn.execute("SELECT DISTINCT report_date FROM plant_data ORDER BY 1").fetchall()]
+    conn.close()
+    return plant_names, dates
+
+
+def make_requests(scenario, rng, plant_names, dates, count):
+    """
+    The call sequence one operator makes for a scenario.
+    """
+    calls = []
+    if scenario == 'plants':
+        calls = [('GET', '/plants', None)] * count
+    elif scenario == 'data_range':
+        for _ in range(count):
+            start = rng.randint(1, 96)
+            params = {
+                'plants': rng.sample(plant_names, rng.randint(1, min(5, len(plant_names)))),
+                'start_block': start,
+                'end_block': min(96, start + rng.randint(0, 16)),
+            }
+            if rng.random() < 0.5:
+                params['report_date'] = rng.choice(dates).isoformat()
+            calls.append(('GET', '/data', params))
+    elif scenario == 'data_block_sweep':
+        # Operator stepping through consecutive blocks of one day
+        start = rng.randint(1, 96)
+        for i in range(count):
+            block = (start + i - 1) % 96 + 1
+            calls.append(('GET', '/data', {'start_block': block, 'end_block': block}))
+    elif scenario == 'get_data_sweep':
+        start = rng.randint(1, 96)
+        day = rng.choice(dates)
+        calls = [('CALL', (start + i - 1) % 96 + 1, day) for i in range(count)]
+    else:
+        raise ValueError(f"Unknown scenario {scenario!r}, expected one of {SCENARIOS}")
+    return calls
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process so far (it never decreases), or
+    None where getrusage is unavailable. ru_maxrss is in KB on Linux and in
+    bytes on macOS.
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if sys.platform == 'darwin' else rss / 2**10
+
+
+async def operator(client, calls, latencies, sizes, errors):
+    # Only successful calls feed latencies/sizes; a fast failure would
+    # otherwise pull the percentiles down and inflate the throughput
+    for method, target, params in calls:
+        start = time.perf_counter()
+        try:
+            if method == 'CALL':
+                df = await asyncio.to_thread(db_utils.fetch_data, target, params)
+                size = int(df.memory_usage(deep=True).sum())
+                error = 'empty result' if df.empty else None
+            else:
+                response = await client.request(method, target, params=params)
+                size = len(response.content)
+                error = f"HTTP {response.status_code}" if response.status_code != 200 else None
+        except Exception as e:
+            size, error = 0, f"{type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+        if error:
+            errors.append(error)
+        else:
+            latencies.append(time.perf_counter() - start)
+            sizes.append(size)
+
+
+async def run_scenario(scenario, operators, requests_per_operator, plant_names, dates, seed, track_memory):
+    rng = random.Random(seed)
+    plans = [make_requests(scenario, rng, plant_names, dates, requests_per_operator) for _ in range(operators)]
+    latencies, sizes, errors = [], [], []
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://loadtest') as client:
+        if track_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        await asyncio.gather(*(operator(client, plan, latencies, sizes, errors) for plan in plans))
+        elapsed = time.perf_counter() - started
+        peak = 0
+        if track_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    ms = np.array(latencies) * 1000
+    requests = len(latencies) + len(errors)
+
+    def percentile(q):
+        return float(np.percentile(ms, q)) if len(ms) else math.nan
+
+    return {
+        'scenario': scenario,
+        'requests': requests,
+        'errors': len(errors),
+        'error_rate': len(errors) / requests if requests else 0.0,
+        'p50_ms': percentile(50),
+        'p95_ms': percentile(95),
+        'p99_ms': percentile(99),
+        'max_ms': percentile(100),
+        'throughput_rps': len(latencies) / elapsed,
+        'mean_response_kb': float(np.mean(sizes)) / 1024 if sizes else math.nan,
+        'peak_traced_mb': peak / 2**20,
+        'peak_rss_mb': peak_rss_mb(),
+        'top_errors': dict(Counter(errors).most_common(3)),
+    }
+
+
+def run(days=30, plants=66, operators=50, requests_per_operator=20, scenarios=SCENARIOS,
+        db_path=None, seed=0, track_memory=True):
+    """
+    Generate a database, point the API and db_utils at it, and run each
+    scenario in turn. Returns one result dict per scenario. The database is
+    deleted afterwards unless db_path was given.
+    """
+    temp_dir = None
+    if db_path is None:
+        temp_dir = tempfile.mkdtemp(prefix='dam_loadtest_')
+        db_path = os.path.join(temp_dir, 'loadtest.db')
+    plant_names, dates = generate_database(db_path, days, plants, seed)
+
+    saved = main.DB_FILE, db_utils.DB_FILE
+    main.DB_FILE = db_utils.DB_FILE = db_path
+    try:
+        return [
+            asyncio.run(run_scenario(s, operators, requests_per_operator, plant_names, dates, seed, track_memory))
+            for s in scenarios
+        ]
+    finally:
+        main.DB_FILE, db_utils.DB_FILE = saved
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def format_report(results):
+    """
+    Latency, req/s and resp KB cover successful calls only. traced MB is the
+    tracemalloc peak of Python allocations during the scenario (DuckDB's own
+    buffers are not traced); RSS MB is the process high-water mark after it.
+    """
+    header = (f"{'scenario':<18}{'reqs':>7}{'errs':>6}{'err %':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+              f"{'ok req/s':>10}{'resp KB':>9}{'traced MB':>11}{'RSS MB':>9}")
+    lines = [header, '-' * len(header)]
+    for r in results:
+        rss = f"{r['peak_rss_mb']:>9.1f}" if r['peak_rss_mb'] is not None else f"{'n/a':>9}"
+        lines.append(
+            f"{r['scenario']:<18}{r['requests']:>7}{r['errors']:>6}{r['error_rate']:>7.1%}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}"
+            f"{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}{r['throughput_rps']:>10.1f}{r['mean_response_kb']:>9.1f}{r['peak_traced_mb']:>11.1f}{rss}"
+        )
+    for r in results:
+        for error, count in r['top_errors'].items():
+            lines.append(f"{r['scenario']}: {count} x {error}")
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="In-process load test of the API and dashboard data paths.")
+    parser.add_argument('--days', type=int, default=30, help="Days in the generated database")
+    parser.add_argument('--plants', type=int, default=66, help="Plants per block in the generated database")
+    parser.add_argument('--operators', type=int, default=50, help="Concurrent operators per scenario")
+    parser.add_argument('--requests', type=int, default=20, help="Requests per operator")
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--db', help="Where to write the generated database (default: a temp dir)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="Skip tracemalloc, which slows every request")
+    parser.add_argument('--json', help="Also write the results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args.days, args.plants, args.operators, args.requests, args.scenarios,
+                  args.db, args.seed, not args.no_memory)
+    print(format_report(results))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=4)
@@ -1,7 +1,12 @@
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, HTTPException, Query
+from pydantic import BaseModel
 import duckdb
 import pandas as pd
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional, Union
+from datetime import date
+from db_utils import LATEST_DATE
+from simulation import simulate
+from export import EXPORT_DIR, EXPORTS, export
 
 app = FastAPI(title="DAM Dashboard API")
 DB_FILE = 'database.db'
@@ -13,15 +18,24 @@ def get_plants():
     conn.close()
     return [p[0] for p in plants]
 
+@app.get("/dates")
+def get_dates():
+    conn = duckdb.connect(DB_FILE)
+    dates = conn.execute("SELECT DISTINCT report_date FROM plant_data ORDER BY report_date").fetchall()
+    conn.close()
+    return [d[0] for d in dates]
+
 @app.get("/data")
 def get_data(
     plants: Optional[List[str]] = Query(None),
     start_block: int = 1,
-    end_block: int = 96
+    end_block: int = 96,
+    report_date: Optional[date] = None
 ):
     conn = duckdb.connect(DB_FILE)
-    query = "SELECT * FROM plant_data WHERE time_block BETWEEN ? AND ?"
-    params = [start_block, end_block]
+    # Same YYYY-MM-DD strings as /dates rather than serialized timestamps
+    query = f"SELECT * REPLACE (strftime(report_date, '%Y-%m-%d') AS report_date) FROM plant_data WHERE time_block BETWEEN ? AND ? AND report_date = {LATEST_DATE}"
+    params = [start_block, end_block, report_date]
     
     if plants:
         placeholders = ', '.join(['?'] * len(plants))
@@ -32,6 +46,45 @@ def get_data(
     conn.close()
     return df.to_dict(orient="records")
 
+class SimulationRequest(BaseModel):
+    category: Literal['State', 'Central']
+    demand_change_mw: Union[float, List[float]] = 0.0
+    price_overrides: Dict[str, float] = {}
+    report_date: Optional[date] = None
+
+@app.post("/simulate")
+def simulate_dispatch(request: SimulationRequest):
+    conn = duckdb.connect(DB_FILE)
+    df = conn.execute(
+        f"SELECT time_block, plant_name, category, dc_mw, sg_mw, bid_price_mwh FROM plant_data WHERE report_date = {LATEST_DATE}",
+        [request.report_date]
+    ).df()
+    conn.close()
+    if df.empty:
+        raise HTTPException(status_code=404, detail=f"No plant_data for report_date {request.report_date or 'latest'}")
+    
+    try:
+        result = simulate(df, request.category, request.demand_change_mw, request.price_overrides)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # NaN is not valid JSON; blocks without a backing candidate have no marginal cost
+    return result.astype(object).where(result.notna(), None).to_dict(orient="records")
+
+@app.post("/export")
+def export_data(
+    format: str = 'parquet',
+    compression: Optional[str] = None,
+    since_version: Optional[int] = None,
+    tables: Optional[List[str]] = Query(None)
+):
+    conn = duckdb.connect(DB_FILE)
+    try:
+        return export(EXPORT_DIR, format, compression, since_version, tables or tuple(EXPORTS), conn=conn)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        conn.close()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
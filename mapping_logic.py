@@ -1,6 +1,8 @@
 import pandas as pd
 import os
 import re
+from headers import source_headers
+from sources import SOURCE_ADAPTERS
 
 data_dir = 'data'
 mod_file = os.path.join(data_dir, 'MOD List Dec_16-12-2025.xlsx')
@@ -10,60 +12,36 @@ df_mod = pd.read_excel(mod_file)
 merit_plants = df_mod[df_mod['Merit/Must'] == 'Merit']['Plant Name'].tolist()
 print(f"Total Merit Plants found: {len(merit_plants)}")
 
-csv_files = {
-    'entvsdl.csv': {'header': [0, 1, 2]},
-    'ipp.csv': {'header': 0},
-    'trader.csv': {'header': 0},
-    'uprvunl.csv': {'header': 0}
-}
-
 mapping_report = []
 
 def clean_name(name):
     return re.sub(r'[^a-zA-Z0-9]', '', str(name)).upper()
 
-for filename, config in csv_files.items():
-    path = os.path.join(data_dir, filename)
-    if not os.path.exists(path):
-        print(f"Warning: {filename} not found.")
-        continue
-    
-    if filename == 'entvsdl.csv':
-        df = pd.read_csv(path, header=config['header'], nrows=0)
-        cols = [' | '.join(col).strip() for col in df.columns.values]
-    else:
-        df = pd.read_csv(path, nrows=0)
-        cols = df.columns.tolist()
+for filename, h in source_headers(data_dir).items():
+    adapter = SOURCE_ADAPTERS[filename]
+    # DC/SG identification is the adapter's, the same rules ingest applies
+    kinds = {col: adapter.classify(col) for col in dict.fromkeys(h['columns'])}
+    kinds = {col: kind for col, kind in kinds.items() if kind}
+    skipped = {clean_name(p) for p in adapter.skip_plants}
 
     print(f"\nAnalyzing {filename}...")
     for plant in merit_plants:
         plant_clean = clean_name(plant)
-        
+        if plant_clean in skipped:
+            continue
+
         found_dc = []
         found_sg = []
-        
-        for col in cols:
-            col_clean = clean_name(col)
-            
+
+        for col, kind in kinds.items():
             # Heuristics for matching
-            if plant_clean in col_clean:
-                # Identification of DC vs SG
-                if filename == 'entvsdl.csv':
-                    # User said: DC is "Onbar Final Ent Amount" or "Final Ent Amount"
-                    # User said: SG is "Schedule Amount"
-                    if 'Final Ent Amount' in col and 'Onbar' in col:
-                        found_dc.append(col)
-                    elif 'Final Ent Amount' in col and 'Onbar' not in col and 'Offbar' not in col:
-                        # For those without Onbar/Offbar distinction
-                        found_dc.append(col)
-                    elif 'Schedule Amount' in col:
-                        found_sg.append(col)
-                else:
-                    # Other CSVs: "DC/ Entitlement" and "SG"
-                    if 'DC/' in col:
-                        found_dc.append(col)
-                    elif 'SG' in col:
-                        found_sg.append(col)
+            if plant_clean in clean_name(col):
+                (found_dc if kind == 'dc' else found_sg).append(col)
+
+        # Utility labels (menukhsg) identify SG columns
+        for label, col in h['sg_labels'].items():
+            if plant_clean in clean_name(label):
+                found_sg.append(col)
         
         if found_dc or found_sg:
             mapping_report.append({
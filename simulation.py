@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+
+# What-if re-dispatch along the merit order for every time block at once.
+# Follows the thermal backing rules of dashboard.calculate_backing: plants
+# with SG = 0 are ignored, and only plants with SG < 0.98 * DC still have
+# headroom to be scheduled up.
+
+BACKING_THRESHOLD = 0.98
+# The same rules as SQL predicates, for the aggregates DuckDB computes
+# (export.BACKING_QUERY, db_utils.get_heatmap)
+ACTIVE_SQL = "sg_mw > 0"
+CANDIDATE_SQL = f"{ACTIVE_SQL} AND sg_mw < {BACKING_THRESHOLD} * dc_mw"
+BLOCK_HOURS = 0.25
+CATEGORIES = ('State', 'Central')
+# Shortfalls below this are floating point noise from the cumulative sums
+UNSERVED_TOLERANCE_MW = 1e-6
+
+
+def to_matrices(df):
+    """
+    Pivot plant_data rows into block x plant arrays.
+    """
+    wide = df.pivot_table(
+        index='time_block', columns='plant_name',
+        values=['dc_mw', 'sg_mw', 'bid_price_mwh'],
+        aggfunc={'dc_mw': 'sum', 'sg_mw': 'sum', 'bid_price_mwh': 'max'},
+    )
+    blocks = wide.index.to_numpy()
+    plants = wide['dc_mw'].columns.to_numpy()
+    dc = wide['dc_mw'].reindex(columns=plants).fillna(0.0).to_numpy()
+    sg = wide['sg_mw'].reindex(columns=plants).fillna(0.0).to_numpy()
+    price = wide['bid_price_mwh'].reindex(columns=plants).fillna(0.0).to_numpy()
+    return blocks, plants, dc, sg, price
+
+
+def allocate(amount, capacity, order):
+    """
+    Fill amount (per block) across capacity (block x plant) in the given
+    per-block plant order. Returns the MW taken from each plant.
+    """
+    cap = np.take_along_axis(capacity, order, axis=1)
+    before = np.cumsum(cap, axis=1) - cap
+    taken_sorted = np.clip(amount[:, None] - before, 0.0, cap)
+    taken = np.zeros_like(capacity)
+    np.put_along_axis(taken, order, taken_sorted, axis=1)
+    return taken
+
+
+def backing(dc, sg, price, plants):
+    """
+    Vectorized calculate_backing: per block, the lowest variable cost plant
+    that can still be backed, its cost, and the cumulative DC - SG quantum.
+    """
+    active = sg > 0
+    quantum = np.where(active, dc - sg, 0.0).sum(axis=1)
+    candidates = active & (sg < BACKING_THRESHOLD * dc)
+    masked = np.where(candidates, price, np.inf)
+    idx = masked.argmin(axis=1)
+    has_plant = candidates.any(axis=1)
+    marginal_plant = np.where(has_plant, plants[idx], 'None')
+    marginal_cost = np.where(has_plant, np.take_along_axis(price, idx[:, None], axis=1)[:, 0], np.nan)
+    return marginal_plant, marginal_cost, quantum
+
+
+def simulate(df, category, demand_change=0.0, price_overrides=None):
+    """
+    Re-dispatch a change in scheduled demand along the merit order of one
+    category ('State' or 'Central'), which the dashboard always reports
+    separately.
+
+    demand_change is in MW, either one value for every block or one value per
+    block (ordered by time_block). An increase is scheduled on the cheapest
+    plants with DC - SG headroom first, a decrease backs down the most
+    expensive running plants first. price_overrides maps plant_name to a new
+    variable cost (Rs/MWh). Raises ValueError for an unknown category, an
+    override naming no plant of the category, or a demand_change that is
+    neither one value nor one per block.
+
+    Returns one row per block with the baseline (current prices, no change)
+    and simulated marginal plant and cost, the backing quantum after
+    re-dispatch, the MW actually moved, any MW that could not be served, and
+    the change in variable cost (Rs).
+    """
+    if category not in CATEGORIES:
+        raise ValueError(f"Unknown category {category!r}, expected one of {CATEGORIES}")
+    df = df[df['category'] == category]
+    if df.empty:
+        return pd.DataFrame(columns=[
+            'time_block', 'base_marginal_plant', 'base_marginal_cost_mwh', 'marginal_plant',
+            'marginal_cost_mwh', 'backing_mw', 'dispatched_mw', 'unserved_mw', 'cost_delta_rs',
+        ])
+
+    blocks, plants, dc, sg, base_price = to_matrices(df)
+    price = base_price.copy()
+    if price_overrides:
+        unknown = [p for p in price_overrides if p not in plants]
+        if unknown:
+            raise ValueError(f"price_overrides name plant(s) not in {category}: {unknown}")
+        for plant, cost in price_overrides.items():
+            price[:, plants == plant] = float(cost)
+
+    values = np.asarray(demand_change, dtype=float)
+    if values.ndim > 1 or values.size not in (1, len(blocks)):
+        raise ValueError(f"demand_change must be one value or one per block ({len(blocks)}), got {values.size}")
+    delta = np.broadcast_to(values, blocks.shape)
+    up = np.clip(delta, 0.0, None)
+    down = np.clip(-delta, 0.0, None)
+
+    active = sg > 0
+    headroom = np.where(active & (sg < BACKING_THRESHOLD * dc), np.clip(dc - sg, 0.0, None), 0.0)
+    running = np.where(active, sg, 0.0)
+
+    ascending = np.argsort(price, axis=1, kind='stable')
+    descending = ascending[:, ::-1]
+    increase = allocate(up, headroom, ascending)
+    decrease = allocate(down, running, descending)
+    moved = increase - decrease
+    new_sg = sg + moved
+
+    base_plant, base_cost, _ = backing(dc, sg, base_price, plants)
+    marginal_plant, marginal_cost, quantum = backing(dc, new_sg, price, plants)
+    dispatched = moved.sum(axis=1)
+    unserved = np.abs(delta) - np.abs(dispatched)
+
+    return pd.DataFrame({
+        'time_block': blocks,
+        'base_marginal_plant': base_plant,
+        'base_marginal_cost_mwh': base_cost,
+        'marginal_plant': marginal_plant,
+        'marginal_cost_mwh': marginal_cost,
+        'backing_mw': quantum,
+        'dispatched_mw': dispatched,
+        'unserved_mw': np.where(unserved > UNSERVED_TOLERANCE_MW, unserved, 0.0),
+        'cost_delta_rs': (moved * price).sum(axis=1) * BLOCK_HOURS,
+    })
@@ -0,0 +1,207 @@
+import pandas as pd
+from collections import namedtuple
+
+# One adapter per utility file. An adapter knows how to parse the file's
+# header, which columns carry DC and SG, how to clean their values and which
+# category the plants belong to. Adapters register themselves by filename in
+# SOURCE_ADAPTERS; ingest_data.ingest() only talks to this interface, so a new
+# region or utility is one more registered class.
+
+DATA_DIR = 'data'
+
+SOURCE_ADAPTERS = {}
+
+ParsedSource = namedtuple('ParsedSource', ['df', 'cols', 'tb_col', 'td_col', 'labels'])
+
+
+def register(cls):
+    SOURCE_ADAPTERS[cls.filename] = cls()
+    return cls
+
+
+def clean_col_name(col):
+    if isinstance(col, tuple):
+        return ' | '.join([str(c).strip() for c in col if 'Unnamed' not in str(c)])
+    return str(col).strip()
+
+
+def find_time_columns(df, cols):
+    tb_col = next((c for c in cols if 'TIME BLOCK' in str(c).upper() or 'TIMEBLOCK' in str(c).upper().replace(' ', '')), None)
+    # Time Desc must not resolve to the Time Block column itself ('TIME' in 'TIME BLOCK')
+    td_col = next((c for c in cols if c != tb_col and ('TIME DESC' in str(c).upper() or 'TIME' == str(c).upper().strip() or 'TIME' in str(c).upper())), None)
+
+    # Fallback for menukhsg logic where Time Block might be in row 0
+    if tb_col is None and len(df) > 0:
+        first_row = df.iloc[0].astype(str).tolist()
+        for i, val in enumerate(first_row):
+            if 'TIME BLOCK' in val.upper():
+                tb_col = df.columns[i]
+            elif 'TIME DESC' in val.upper() or '00:00-00:15' in val:
+                td_col = df.columns[i]
+    return tb_col, td_col
+
+
+def coerce_numeric(values):
+    """
+    Convert a frame of raw cell values to floats the way ingest does
+    (menukhsg values carry a leading '+').
+    """
+    def to_numeric(series):
+        if series.dtype == object:
+            series = series.str.replace('+', '', regex=False).str.strip()
+        return pd.to_numeric(series, errors='coerce')
+
+    # Column by column (apply goes by position), so duplicated labels are
+    # cleaned independently instead of selecting every duplicate at once
+    return values.apply(to_numeric)
+
+
+class SourceAdapter:
+    """
+    Defaults match the plain single-header utility exports (trader.csv):
+    'DC/ Entitlement' columns are DC, 'SG' columns are SG, Central category.
+    """
+    filename = None
+    header = 0
+    encoding = None
+    # Row above the header holding utility labels that identify SG columns
+    label_row = None
+    category = 'Central'
+    # Plants this file must not contribute (duplicates of another source)
+    skip_plants = ()
+
+    @property
+    def config(self):
+        return {'header': self.header, 'encoding': self.encoding, 'label_row': self.label_row}
+
+    def read_kwargs(self):
+        kwargs = {'header': self.header}
+        if self.encoding:
+            kwargs['encoding'] = self.encoding
+        return kwargs
+
+    def flatten(self, columns):
+        if isinstance(columns, pd.MultiIndex):
+            return [clean_col_name(c) for c in columns]
+        return columns.tolist()
+
+    def read_labels(self, path, cols):
+        if self.label_row is None:
+            return {}
+        df_header = pd.read_csv(path, encoding=self.encoding, header=None, nrows=self.label_row + 3)
+        return self.parse_labels(df_header, cols)
+
+    def parse_labels(self, df_header, cols):
+        labels = {}
+        for i, val in enumerate(df_header.iloc[self.label_row].tolist()):
+            if pd.notna(val) and str(val).strip() and i < len(cols):
+                labels[str(val).strip()] = cols[i]
+        return labels
+
+    def read(self, path):
+        df = pd.read_csv(path, **self.read_kwargs())
+        cols = self.flatten(df.columns)
+        df.columns = cols
+        tb_col, td_col = find_time_columns(df, cols)
+        return ParsedSource(df, cols, tb_col, td_col, self.read_labels(path, cols))
+
+    def classify(self, col):
+        """
+        'dc', 'sg' or None for a flattened column name.
+        """
+        if 'DC/' in col:
+            return 'dc'
+        if 'SG' in col:
+            return 'sg'
+        return None
+
+    def clean_values(self, values):
+        return coerce_numeric(values)
+
+    def resolve(self, cols, labels, plant_mappings):
+        """
+        Map every plant this file serves to its (dc_cols, sg_cols). Columns
+        are classified once, then only the classified ones are matched
+        against the aliases.
+        """
+        kinds = {}
+        for col in dict.fromkeys(cols):
+            kind = self.classify(col)
+            if kind:
+                kinds[col] = kind
+
+        resolved = {}
+        for mod_name, aliases in plant_mappings.items():
+            if mod_name in self.skip_plants:
+                continue
+            dc_cols, sg_cols = {}, {}
+            for alias in aliases:
+                for label, col in labels.items():
+                    if alias.upper() in label.upper():
+                        sg_cols[col] = None
+                for col, kind in kinds.items():
+                    if alias in col:
+                        (dc_cols if kind == 'dc' else sg_cols)[col] = None
+            if dc_cols or sg_cols:
+                resolved[mod_name] = (list(dc_cols), list(sg_cols))
+        return resolved
+
+
+@register
+class EntVsDlAdapter(SourceAdapter):
+    filename = 'entvsdl.csv'
+    header = [0, 1, 2]
+
+    def classify(self, col):
+        if 'Final Ent Amount' in col and 'Onbar' in col:
+            return 'dc'
+        if 'Schedule Amount' in col:
+            return 'sg'
+        return None
+
+
+@register
+class IppAdapter(SourceAdapter):
+    filename = 'ipp.csv'
+    category = 'State'
+    # User confirmed Ghatampur in ipp.csv is a duplicate and should be ignored
+    skip_plants = ('GHATAMPUR',)
+
+
+@register
+class TraderAdapter(SourceAdapter):
+    filename = 'trader.csv'
+
+
+@register
+class UprvunlAdapter(SourceAdapter):
+    filename = 'uprvunl.csv'
+    category = 'State'
+
+
+@register
+class MenukhDcAdapter(SourceAdapter):
+    filename = 'menukhdc.csv'
+    header = [0, 1]
+    encoding = 'utf-16le'
+
+    def classify(self, col):
+        # DC for these plants is strictly under "Total Ent"
+        if col.split(' | ')[-1] == 'Total Ent':
+            return 'dc'
+        return None
+
+
+@register
+class MenukhSgAdapter(SourceAdapter):
+    filename = 'menukhsg.csv'
+    header = 6
+    encoding = 'utf-16le'
+    # Utility names are in Row 2 of the original file, above the header row
+    label_row = 2
+
+    def classify(self, col):
+        # SG columns are identified through the utility labels
+        if 'DC/' in col:
+            return 'dc'
+        return None
@@ -0,0 +1,178 @@
+import pandas as pd
+
+# Pre-ingest checks for the daily CSV drops. Every check works on whole
+# frames at once so a bad file is caught before the per-plant loop in
+# ingest_data.ingest() and before the existing plant_data table is dropped.
+
+EXPECTED_BLOCKS = range(1, 97)
+FAIL_POLICIES = ('strict', 'warn', 'off')
+DEFAULT_POLICY = 'strict'
+MAX_COERCION_RATE = 0.05
+
+
+class ValidationError(Exception):
+    def __init__(self, report):
+        self.report = report
+        super().__init__(f"Validation failed with {len(report['errors'])} error(s):\n" + '\n'.join(report['errors']))
+
+
+def first_series(df, col):
+    # If multiple columns have the same name, take the first one
+    values = df[col]
+    if isinstance(values, pd.DataFrame):
+        return values.iloc[:, 0]
+    return values
+
+
+def check_source(adapter, source, plant_mappings, max_coercion_rate=MAX_COERCION_RATE):
+    """
+    Validate one parsed source (adapter.read) against the columns ingest will
+    load: header shape, 1-96 block coverage, which mapped plants
+    adapter.resolve serves and the numeric coercion rate of their DC/SG
+    columns after adapter.clean_values.
+    """
+    filename = adapter.filename
+    df, cols, tb_col, td_col, labels = source
+    result = {
+        'file': filename,
+        'rows': len(df),
+        'columns': len(cols),
+        'time_block_col': tb_col,
+        'time_desc_col': td_col,
+        'missing_blocks': [],
+        'duplicate_blocks': [],
+        'out_of_range_rows': 0,
+        'coercion_failures': {},
+        'plants_matched': [],
+        'errors': [],
+        'warnings': [],
+    }
+
+    # Mapping completeness for this file, before any early return so a file
+    # with header errors does not make its plants look unmatched
+    resolved = adapter.resolve(cols, labels, plant_mappings)
+    result['plants_matched'] = list(resolved)
+    used_cols = {c for dc_cols, sg_cols in resolved.values() for c in dc_cols + sg_cols}
+    if not result['plants_matched']:
+        result['errors'].append(f"{filename}: no mapped plant matches any column")
+
+    # Header shape
+    if tb_col is None or td_col is None:
+        result['errors'].append(f"{filename}: could not find Time Block/Desc columns")
+        return result
+    if tb_col == td_col:
+        result['errors'].append(f"{filename}: Time Block and Time Desc resolve to the same column {tb_col!r}")
+        return result
+    value_positions = [i for i, c in enumerate(cols) if c in used_cols and c not in (tb_col, td_col)]
+    duplicated = pd.Index(cols)[value_positions]
+    duplicated = duplicated[duplicated.duplicated()].unique().tolist()
+    if duplicated:
+        result['warnings'].append(f"{filename}: {len(duplicated)} duplicated column name(s), e.g. {duplicated[0]!r}")
+
+    # Block coverage. Rows without a numeric block are the summary rows
+    # (Maximum/Minimum/Average) and the repeated label row in menukhsg.
+    blocks = pd.to_numeric(first_series(df, tb_col), errors='coerce')
+    in_range = blocks.between(EXPECTED_BLOCKS.start, EXPECTED_BLOCKS.stop - 1) & (blocks == blocks.round())
+    result['out_of_range_rows'] = int((blocks.notna() & ~in_range).sum())
+    if result['out_of_range_rows']:
+        result['warnings'].append(f"{filename}: {result['out_of_range_rows']} row(s) with a time block outside 1-96")
+
+    valid_blocks = blocks[in_range].astype(int)
+    counts = valid_blocks.value_counts()
+    result['missing_blocks'] = sorted(set(EXPECTED_BLOCKS) - set(counts.index))
+    result['duplicate_blocks'] = sorted(counts[counts > 1].index.tolist())
+    if result['missing_blocks']:
+        result['errors'].append(f"{filename}: {len(result['missing_blocks'])} of 96 time blocks missing, e.g. {result['missing_blocks'][:5]}")
+    if result['duplicate_blocks']:
+        result['errors'].append(f"{filename}: time blocks appear more than once: {result['duplicate_blocks'][:5]}")
+
+    # Numeric coercion rate, only over the block rows and DC/SG columns that
+    # would be ingested
+    raw = df.iloc[in_range.to_numpy(), value_positions]
+    present = raw.notna().to_numpy()
+    failed = adapter.clean_values(raw).isna().to_numpy() & present
+    present_counts = present.sum(axis=0)
+    failed_counts = failed.sum(axis=0)
+    # Every failed cell would be summed as 0, so each one is reported; the
+    # threshold only decides when a column turns from warning into error
+    for pos, n_present, n_failed in zip(value_positions, present_counts, failed_counts):
+        if not n_failed:
+            continue
+        rate = float(n_failed / n_present)
+        result['coercion_failures'][cols[pos]] = {'failed': int(n_failed), 'rate': round(rate, 4)}
+        message = f"{filename}: {int(n_failed)} non-numeric value(s) in {cols[pos]!r} ({rate:.0%})"
+        if rate > max_coercion_rate:
+            result['errors'].append(message)
+        else:
+            result['warnings'].append(message)
+
+    return result
+
+
+def check_mappings(plant_mappings, df_mod, plant_col, price_col, matched_plants):
+    """
+    Validate plant_mappings.json against the MOD list and the matched headers.
+    """
+    result = {
+        'plants': len(plant_mappings),
+        'missing_in_mod': [],
+        'missing_price': [],
+        'unmatched': [],
+        'errors': [],
+        'warnings': [],
+    }
+    if price_col is None or plant_col not in df_mod.columns:
+        result['errors'].append("MOD list: could not find Plant Name / Variable Cost columns")
+        return result
+
+    mod = df_mod.drop_duplicates(subset=plant_col).set_index(plant_col)
+    names = pd.Index(list(plant_mappings))
+    result['missing_in_mod'] = names[~names.isin(mod.index)].tolist()
+    prices = pd.to_numeric(mod[price_col].reindex(names[names.isin(mod.index)]), errors='coerce')
+    result['missing_price'] = prices[prices.isna()].index.tolist()
+    result['unmatched'] = names[~names.isin(list(matched_plants))].tolist()
+
+    if result['missing_in_mod']:
+        result['errors'].append(f"MOD list: {len(result['missing_in_mod'])} mapped plant(s) not found, e.g. {result['missing_in_mod'][:5]}")
+    if result['missing_price']:
+        result['errors'].append(f"MOD list: {len(result['missing_price'])} mapped plant(s) without a numeric price, e.g. {result['missing_price'][:5]}")
+    # An unmatched plant silently drops out of the day, like a missing file
+    if result['unmatched']:
+        result['errors'].append(f"Mappings: {len(result['unmatched'])} plant(s) matched no column in any file, e.g. {result['unmatched'][:5]}")
+    return result
+
+
+def build_report(file_results, mapping_result, missing_files=()):
+    # A missing source would replace the day without its plants
+    errors = [f"{f}: file not found" for f in missing_files]
+    warnings = []
+    for r in list(file_results.values()) + [mapping_result]:
+        errors.extend(r['errors'])
+        warnings.extend(r['warnings'])
+    return {
+        'ok': not errors,
+        'files': file_results,
+        'missing_files': list(missing_files),
+        'mappings': mapping_result,
+        'errors': errors,
+        'warnings': warnings,
+    }
+
+
+def enforce_policy(report, policy=DEFAULT_POLICY):
+    """
+    Apply the failure policy: 'strict' raises ValidationError on any error,
+    'warn' prints the problems and lets ingest carry on, 'off' does nothing.
+    """
+    if policy not in FAIL_POLICIES:
+        raise ValueError(f"Unknown validation policy {policy!r}, expected one of {FAIL_POLICIES}")
+    if policy == 'off':
+        return
+    for w in report['warnings']:
+        print(f"Warning: {w}")
+    if report['ok']:
+        return
+    if policy == 'strict':
+        raise ValidationError(report)
+    for e in report['errors']:
+        print(f"Error: {e}")
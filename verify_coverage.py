@@ -1,6 +1,12 @@
 import pandas as pd
 import os
 import json
+import argparse
+from headers import scan_headers, source_headers
+
+parser = argparse.ArgumentParser(description="Check that every merit plant's mapping matches a CSV column.")
+parser.add_argument('root', nargs='?', help="Scan every daily drop (folder of CSVs) under this folder instead of data/ only")
+args = parser.parse_args()
 
 # Paths
 data_dir = 'data'
@@ -14,26 +20,17 @@ merit_plants = df_mod[df_mod['Merit/Must'] == 'Merit']['Plant Name'].tolist()
 with open(mapping_file, 'r', encoding='utf-8') as f:
     plant_mappings = json.load(f)
 
-# CSV headers
-csv_files = {
-    'entvsdl.csv': {'header': [0, 1, 2]},
-    'ipp.csv': {'header': 0},
-    'trader.csv': {'header': 0},
-    'uprvunl.csv': {'header': 0}
-}
-
-all_cols = {}
-for filename, config in csv_files.items():
-    path = os.path.join(data_dir, filename)
-    if not os.path.exists(path):
-        continue
-    if filename == 'entvsdl.csv':
-        df = pd.read_csv(path, header=config['header'], nrows=0)
-        cols = [' | '.join(col).strip() for col in df.columns.values]
-    else:
-        df = pd.read_csv(path, nrows=0)
-        cols = df.columns.tolist()
-    all_cols[filename] = cols
+# CSV headers per drop folder (menukhsg SG columns are matched through
+# their utility labels). Headers are cached, so re-scans only read new files.
+drops = {}
+if args.root:
+    for path, h in scan_headers(args.root).items():
+        drops.setdefault(os.path.dirname(path), {})[os.path.basename(path)] = h['columns'] + list(h['sg_labels'])
+else:
+    drops[data_dir] = {
+        filename: h['columns'] + list(h['sg_labels'])
+        for filename, h in source_headers(data_dir).items()
+    }
 
 # Verify
 missing_in_json = [p for p in merit_plants if p not in plant_mappings]
@@ -42,22 +39,24 @@ print(f"Missing in JSON: {len(missing_in_json)}")
 for p in missing_in_json:
     print(f"- {p}")
 
-mapping_coverage = {}
-for plant in merit_plants:
-    if plant in plant_mappings:
-        keywords = plant_mappings[plant]
-        found_match = False
-        for filename, cols in all_cols.items():
-            for col in cols:
-                for kw in keywords:
-                    if kw in col:
-                        found_match = True
-                        break
+for drop, all_cols in sorted(drops.items()):
+    mapping_coverage = {}
+    for plant in merit_plants:
+        if plant in plant_mappings:
+            keywords = plant_mappings[plant]
+            found_match = False
+            for filename, cols in all_cols.items():
+                for col in cols:
+                    for kw in keywords:
+                        if kw in col:
+                            found_match = True
+                            break
+                    if found_match: break
                 if found_match: break
-            if found_match: break
-        mapping_coverage[plant] = found_match
+            mapping_coverage[plant] = found_match
 
-not_found_in_csv = [p for p, found in mapping_coverage.items() if not found]
-print(f"\nNot found in CSV columns: {len(not_found_in_csv)}")
-for p in not_found_in_csv:
-    print(f"- {p}")
+    not_found_in_csv = [p for p, found in mapping_coverage.items() if not found]
+    where = f" in {drop}" if args.root else ""
+    print(f"\nNot found in CSV columns{where}: {len(not_found_in_csv)}")
+    for p in not_found_in_csv:
+        print(f"- {p}")